@@ -436,7 +436,7 @@ async def _run_single_deploy(
                 " run\n\t[yellow]prefect project register-flow"
                 " ./path/to/file.py:flow_fn_name[/yellow]\nto register its location."
             )
-        with open(prefect_dir / "flows.json", "r") as f:
+        with open(prefect_dir / "flows.json", "r", encoding="utf-8") as f:
             flows = json.load(f)
 
         if deploy_config["flow_name"] not in flows:
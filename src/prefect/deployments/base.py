@@ -6,16 +6,22 @@ To get started, follow along with [the deloyments tutorial](/tutorials/deploymen
 """
 import ast
 import asyncio
-import json
+import io
 import math
 import os
+import shutil
+import stat
 import subprocess
 import sys
 from copy import deepcopy
+from dataclasses import asdict, dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, cast
+from typing import Dict, List, Optional, Tuple, cast
+from uuid import uuid4
 
 import anyio
+import orjson
 import yaml
 
 from prefect._internal.pydantic import HAS_PYDANTIC_V2
@@ -29,12 +35,21 @@ from ruamel.yaml import YAML
 
 from prefect.client.schemas.objects import MinimalDeploymentSchedule
 from prefect.client.schemas.schedules import IntervalSchedule
-from prefect.flows import load_flow_from_entrypoint
+from prefect.flows import Flow, load_flow_from_entrypoint
 from prefect.logging import get_logger
 from prefect.settings import PREFECT_DEBUG_MODE
+from prefect.utilities.annotations import NotSet
 from prefect.utilities.asyncutils import LazySemaphore, run_sync_in_worker_thread
 from prefect.utilities.filesystem import create_default_ignore_file, get_open_file_limit
-from prefect.utilities.templating import apply_values
+from prefect.utilities.templating import apply_values, find_placeholders
+
+# prefer the LibYAML bindings when PyYAML was built with them
+try:
+    from yaml import CDumper as _YamlDumper
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import Dumper as _YamlDumper
+    from yaml import SafeLoader as _YamlLoader
 
 
 def find_prefect_directory(path: Path = None) -> Optional[Path]:
@@ -46,15 +61,27 @@ def find_prefect_directory(path: Path = None) -> Optional[Path]:
 
     If one is never found, `None` is returned.
     """
-    path = Path(path or ".").resolve()
-    parent = path.parent.resolve()
-    while path != parent:
-        prefect_dir = path.joinpath(".prefect")
-        if prefect_dir.is_dir():
-            return prefect_dir
+    directory = os.path.realpath(path or ".")
+
+    # `directory` is already resolved, so none of its parents need to be
+    parent = os.path.dirname(directory)
+    while directory != parent:
+        candidate = os.path.join(directory, ".prefect")
+        if _is_directory(candidate):
+            return Path(candidate)
+
+        directory = parent
+        parent = os.path.dirname(directory)
+
 
-        path = parent.resolve()
-        parent = path.parent.resolve()
+def _is_directory(path: str) -> bool:
+    """
+    Returns whether `path` is an existing directory, using a single `stat` call.
+    """
+    try:
+        return stat.S_ISDIR(os.stat(path).st_mode)
+    except OSError:
+        return False
 
 
 def set_prefect_hidden_dir(path: str = None) -> bool:
@@ -64,15 +91,67 @@ def set_prefect_hidden_dir(path: str = None) -> bool:
 
     If a path is provided, the directory will be created in that location.
     """
-    path = Path(path or ".") / ".prefect"
+    path = os.path.join(path or ".", ".prefect")
 
     # use exists so that we dont accidentally overwrite a file
-    if path.exists():
+    if os.path.exists(path):
         return False
-    path.mkdir(mode=0o0700)
+    os.mkdir(path, mode=0o0700)
     return True
 
 
+@lru_cache()
+def _load_default_prefect_yaml_template() -> dict:
+    """
+    Loads and caches the contents of the default `prefect.yaml` template.
+    """
+    default_file = Path(__file__).parent / "templates" / "prefect.yaml"
+    with default_file.open(mode="r") as df:
+        return yaml.load(df, Loader=_YamlLoader)
+
+
+_PREFECT_YAML_HEADER = (
+    "# Welcome to your prefect.yaml file! You can use this file for storing and"
+    " managing\n# configuration for deploying your flows. We recommend committing"
+    " this file to source\n# control along with your flow code.\n\n"
+    "# Generic metadata about this project\n"
+)
+
+# the comment written above each section of a generated `prefect.yaml`, in file order
+_PREFECT_YAML_SECTION_COMMENTS = [
+    ("build", "# build section allows you to manage and build docker images\n"),
+    (
+        "push",
+        "# push section allows you to manage if and how this project is uploaded to"
+        " remote locations\n",
+    ),
+    (
+        "pull",
+        "# pull section allows you to provide instructions for cloning this project in"
+        " remote locations\n",
+    ),
+    (
+        "deployments",
+        "# the deployments section allows you to provide configuration for deploying"
+        " flows\n",
+    ),
+]
+
+
+@lru_cache()
+def _render_default_prefect_yaml_sections() -> Dict[str, str]:
+    """
+    Serializes and caches each section of the default `prefect.yaml` template.
+    """
+    default_contents = _load_default_prefect_yaml_template()
+    return {
+        key: yaml.dump(
+            {key: default_contents.get(key)}, Dumper=_YamlDumper, sort_keys=False
+        )
+        for key, _ in _PREFECT_YAML_SECTION_COMMENTS
+    }
+
+
 def create_default_prefect_yaml(
     path: str, name: str = None, contents: dict = None
 ) -> bool:
@@ -86,81 +165,83 @@ def create_default_prefect_yaml(
         contents (dict, optional): a dictionary of contents to write to the file; if not provided,
             defaults will be used
     """
-    path = Path(path)
-    prefect_file = path / "prefect.yaml"
-    if prefect_file.exists():
+    prefect_file = os.path.join(path, "prefect.yaml")
+    if os.path.exists(prefect_file):
         return False
-    default_file = Path(__file__).parent / "templates" / "prefect.yaml"
-
-    with default_file.open(mode="r") as df:
-        default_contents = yaml.safe_load(df)
-
     import prefect
 
     contents["prefect-version"] = prefect.__version__
     contents["name"] = name
 
-    with prefect_file.open(mode="w") as f:
-        # write header
-        f.write(
-            "# Welcome to your prefect.yaml file! You can use this file for storing and"
-            " managing\n# configuration for deploying your flows. We recommend"
-            " committing this file to source\n# control along with your flow code.\n\n"
-        )
+    default_sections = _render_default_prefect_yaml_sections()
 
-        f.write("# Generic metadata about this project\n")
-        yaml.dump({"name": contents["name"]}, f, sort_keys=False)
-        yaml.dump({"prefect-version": contents["prefect-version"]}, f, sort_keys=False)
-        f.write("\n")
+    # serialize every section into memory so the file is written in a single call
+    buffer = io.StringIO()
+    buffer.write(_PREFECT_YAML_HEADER)
+    yaml.dump(
+        {"name": contents["name"], "prefect-version": contents["prefect-version"]},
+        buffer,
+        Dumper=_YamlDumper,
+        sort_keys=False,
+    )
+    for key, comment in _PREFECT_YAML_SECTION_COMMENTS:
+        buffer.write("\n")
+        buffer.write(comment)
+        if key in contents:
+            yaml.dump({key: contents[key]}, buffer, Dumper=_YamlDumper, sort_keys=False)
+        else:
+            # sections taken from the template never change, so reuse their output
+            buffer.write(default_sections[key])
 
-        # build
-        f.write("# build section allows you to manage and build docker images\n")
-        yaml.dump(
-            {"build": contents.get("build", default_contents.get("build"))},
-            f,
-            sort_keys=False,
-        )
-        f.write("\n")
+    with open(prefect_file, mode="w") as f:
+        f.write(buffer.getvalue())
+    return True
 
-        # push
-        f.write(
-            "# push section allows you to manage if and how this project is uploaded to"
-            " remote locations\n"
-        )
-        yaml.dump(
-            {"push": contents.get("push", default_contents.get("push"))},
-            f,
-            sort_keys=False,
-        )
-        f.write("\n")
 
-        # pull
-        f.write(
-            "# pull section allows you to provide instructions for cloning this project"
-            " in remote locations\n"
-        )
-        yaml.dump(
-            {"pull": contents.get("pull", default_contents.get("pull"))},
-            f,
-            sort_keys=False,
-        )
-        f.write("\n")
+@lru_cache()
+def _load_recipe(recipe: str) -> dict:
+    """
+    Loads and caches the unformatted contents of a recipe's `prefect.yaml` file.
+
+    Raises:
+        ValueError: if provided recipe name does not exist.
+    """
+    recipe_path = Path(__file__).parent / "recipes" / recipe / "prefect.yaml"
+
+    if not recipe_path.exists():
+        raise ValueError(f"Unknown recipe {recipe!r} provided.")
+
+    with recipe_path.open(mode="r") as f:
+        return yaml.load(f, Loader=_YamlLoader)
 
-        # deployments
-        f.write(
-            "# the deployments section allows you to provide configuration for"
-            " deploying flows\n"
-        )
-        yaml.dump(
-            {
-                "deployments": contents.get(
-                    "deployments", default_contents.get("deployments")
-                )
-            },
-            f,
-            sort_keys=False,
-        )
-    return True
+
+def _find_placeholder_paths(template, path: tuple = ()) -> List[Tuple[tuple, str]]:
+    """
+    Returns the path and value of every string in `template` containing
+    placeholders, in document order.
+    """
+    if isinstance(template, dict):
+        items = template.items()
+    elif isinstance(template, list):
+        items = enumerate(template)
+    elif isinstance(template, str) and find_placeholders(template):
+        return [(path, template)]
+    else:
+        return []
+
+    return [
+        placeholder_path
+        for key, value in items
+        for placeholder_path in _find_placeholder_paths(value, path + (key,))
+    ]
+
+
+@lru_cache()
+def _get_recipe_placeholder_paths(recipe: str) -> List[Tuple[tuple, str]]:
+    """
+    Returns the cached placeholder locations for a recipe's `prefect.yaml` file.
+    """
+    return _find_placeholder_paths(_load_recipe(recipe))
 
 
 def configure_project_by_recipe(recipe: str, **formatting_kwargs) -> dict:
@@ -174,26 +255,69 @@ def configure_project_by_recipe(recipe: str, **formatting_kwargs) -> dict:
     Raises:
         ValueError: if provided recipe name does not exist.
     """
-    # load the recipe
-    recipe_path = Path(__file__).parent / "recipes" / recipe / "prefect.yaml"
+    config = deepcopy(_load_recipe(recipe))
+
+    # only strings with placeholders need templating; this matches calling
+    # `apply_values` on the whole recipe with `remove_notset=False`. Paths are
+    # visited in reverse so removing an unset list item doesn't shift later ones.
+    for path, template in reversed(_get_recipe_placeholder_paths(recipe)):
+        *parent_path, key = path
+        parent = config
+        for part in parent_path:
+            parent = parent[part]
+
+        value = apply_values(template, formatting_kwargs, remove_notset=False)
+        if value is not NotSet:
+            parent[key] = value
+        elif isinstance(parent, list):
+            del parent[key]
 
-    if not recipe_path.exists():
-        raise ValueError(f"Unknown recipe {recipe!r} provided.")
+    return config
 
-    with recipe_path.open(mode="r") as f:
-        config = yaml.safe_load(f)
 
-    config = apply_values(
-        template=config, values=formatting_kwargs, remove_notset=False
-    )
+@lru_cache()
+def _git_is_available() -> bool:
+    """
+    Returns whether a `git` executable can be found on the path.
+    """
+    return shutil.which("git") is not None
 
-    return config
+
+def _is_in_git_repository(directory: str) -> bool:
+    """
+    Returns whether `directory` or any of its parents contains a `.git` entry.
+
+    Not cached, since a repository may be created after an earlier negative check.
+    """
+    while True:
+        if os.path.lexists(os.path.join(directory, ".git")):
+            return True
+
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return False
+        directory = parent
+
+
+def _should_probe_git() -> bool:
+    """
+    Returns whether running `git` in the current directory could yield any
+    information, so that subprocesses are only spawned when they can succeed.
+    """
+    if not _git_is_available():
+        return False
+
+    # an explicit repository location makes the directory layout irrelevant
+    return "GIT_DIR" in os.environ or _is_in_git_repository(os.getcwd())
 
 
 def _get_git_remote_origin_url() -> Optional[str]:
     """
     Returns the git remote origin URL for the current directory.
     """
+    if not _should_probe_git():
+        return None
+
     try:
         origin_url = subprocess.check_output(
             ["git", "config", "--get", "remote.origin.url"],
@@ -211,6 +335,9 @@ def _get_git_branch() -> Optional[str]:
     """
     Returns the git branch for the current directory.
     """
+    if not _should_probe_git():
+        return None
+
     try:
         branch = subprocess.check_output(["git", "rev-parse", "--abbrev-ref", "HEAD"])
         branch = branch.decode().strip()
@@ -220,6 +347,27 @@ def _get_git_branch() -> Optional[str]:
     return branch
 
 
+@dataclass
+class _ProjectInitValues:
+    """
+    Values inferred from the current directory that are used to format a recipe
+    when initializing a project.
+    """
+
+    directory: str
+    name: str
+    repository: Optional[str] = None
+    branch: Optional[str] = None
+    dockerfile: Optional[str] = None
+
+    def to_formatting_kwargs(self) -> Dict[str, str]:
+        """
+        Returns the values that were set; placeholders for unset values are left
+        untouched by the recipe.
+        """
+        return {key: value for key, value in asdict(self).items() if value is not None}
+
+
 def initialize_project(
     name: str = None, recipe: str = None, inputs: dict = None
 ) -> List[str]:
@@ -237,24 +385,23 @@ def initialize_project(
     """
     # determine if in git repo or use directory name as a default
     is_git_based = False
-    formatting_kwargs = {"directory": str(Path(".").absolute().resolve())}
-    dir_name = os.path.basename(os.getcwd())
+    cwd = os.getcwd()
+    dir_name = os.path.basename(cwd)
+    values = _ProjectInitValues(directory=cwd, name=dir_name)
 
     remote_url = _get_git_remote_origin_url()
     if remote_url:
-        formatting_kwargs["repository"] = remote_url
+        values.repository = remote_url
         is_git_based = True
         branch = _get_git_branch()
-        formatting_kwargs["branch"] = branch or "main"
+        values.branch = branch or "main"
 
-    formatting_kwargs["name"] = dir_name
-
-    has_dockerfile = Path("Dockerfile").exists()
+    has_dockerfile = os.path.exists(os.path.join(cwd, "Dockerfile"))
 
     if has_dockerfile:
-        formatting_kwargs["dockerfile"] = "Dockerfile"
+        values.dockerfile = "Dockerfile"
     elif recipe is not None and "docker" in recipe:
-        formatting_kwargs["dockerfile"] = "auto"
+        values.dockerfile = "auto"
 
     # hand craft a pull step
     if is_git_based and recipe is None:
@@ -267,6 +414,7 @@ def initialize_project(
     elif recipe is None:
         recipe = "local"
 
+    formatting_kwargs = values.to_formatting_kwargs()
     formatting_kwargs.update(inputs or {})
     configuration = configure_project_by_recipe(recipe=recipe, **formatting_kwargs)
 
@@ -283,6 +431,15 @@ def initialize_project(
     return files
 
 
+@lru_cache(maxsize=256)
+def _load_flow_from_entrypoint_cached(entrypoint: str, mtime_ns: Optional[int]) -> Flow:
+    """
+    Loads a flow from an entrypoint, reusing the result for as long as the
+    modification time of the script containing it is unchanged.
+    """
+    return load_flow_from_entrypoint(entrypoint)
+
+
 async def register_flow(entrypoint: str, force: bool = False):
     """
     Register a flow with this project from an entrypoint.
@@ -308,9 +465,7 @@ async def register_flow(entrypoint: str, force: bool = False):
         else:
             raise exc
 
-    flow = await run_sync_in_worker_thread(load_flow_from_entrypoint, entrypoint)
-
-    fpath = Path(fpath).absolute()
+    # locate the project before paying for importing the flow
     prefect_dir = find_prefect_directory()
     if not prefect_dir:
         raise FileNotFoundError(
@@ -318,15 +473,35 @@ async def register_flow(entrypoint: str, force: bool = False):
             " init` to create one."
         )
 
-    entrypoint = f"{fpath.relative_to(prefect_dir.parent)!s}:{obj_name}"
+    fpath = Path(fpath).absolute()
+    try:
+        mtime_ns = os.stat(fpath).st_mtime_ns
+    except OSError:
+        # let `load_flow_from_entrypoint` report the unreadable script
+        mtime_ns = None
+
+    flow = await run_sync_in_worker_thread(
+        _load_flow_from_entrypoint_cached, f"{fpath}:{obj_name}", mtime_ns
+    )
+
+    relative_fpath = os.path.relpath(fpath, prefect_dir.parent)
+    if relative_fpath.split(os.sep, 1)[0] == os.pardir:
+        raise ValueError(
+            f"Flow script {str(fpath)!r} is not within the project directory"
+            f" {str(prefect_dir.parent)!r}."
+        )
+    entrypoint = f"{relative_fpath}:{obj_name}"
 
     flows_file = prefect_dir / "flows.json"
     if flows_file.exists():
-        with flows_file.open(mode="r") as f:
-            flows = json.load(f)
+        flows = orjson.loads(flows_file.read_bytes())
     else:
         flows = {}
 
+    # nothing to write if this exact registration already exists
+    if flows.get(flow.name) == entrypoint:
+        return flow
+
     ## quality control
     if flow.name in flows and flows[flow.name] != entrypoint:
         if not force:
@@ -339,8 +514,20 @@ async def register_flow(entrypoint: str, force: bool = False):
 
     flows[flow.name] = entrypoint
 
-    with flows_file.open(mode="w") as f:
-        json.dump(flows, f, sort_keys=True, indent=2)
+    payload = orjson.dumps(flows, option=orjson.OPT_SORT_KEYS | orjson.OPT_INDENT_2)
+
+    # swap a fully written file into place so `flows.json` is never left truncated;
+    # exclusive creation gives the file the usual umask-derived permissions
+    tmp_file = prefect_dir / f"flows.{uuid4().hex}.json.tmp"
+    try:
+        with tmp_file.open(mode="xb") as f:
+            f.write(payload)
+        if flows_file.exists():
+            os.chmod(tmp_file, stat.S_IMODE(os.stat(flows_file).st_mode))
+        os.replace(tmp_file, flows_file)
+    except BaseException:
+        tmp_file.unlink(missing_ok=True)
+        raise
 
     return flow
 
@@ -361,28 +548,30 @@ def _copy_deployments_into_prefect_file():
 
     with deployment_file.open(mode="r") as f:
         raw_deployment_file_contents = f.read()
-        parsed_deployment_file_contents = yaml.safe_load(raw_deployment_file_contents)
+    parsed_deployment_file_contents = yaml.load(
+        raw_deployment_file_contents, Loader=_YamlLoader
+    )
 
-    deployments = parsed_deployment_file_contents.get("deployments")
+    # If deployment.yaml is empty, write an empty deployments list to prefect.yaml.
+    if not parsed_deployment_file_contents:
+        new_contents = yaml.dump(
+            {"deployments": []}, Dumper=_YamlDumper, sort_keys=False
+        )
+    # If there is no 'deployments' key in deployment.yaml, assume that the
+    # entire file is a single deployment.
+    elif not parsed_deployment_file_contents.get("deployments"):
+        new_contents = yaml.dump(
+            {"deployments": [parsed_deployment_file_contents]},
+            Dumper=_YamlDumper,
+            sort_keys=False,
+        )
+    # Write all of deployment.yaml to prefect.yaml, preserving its comments and
+    # formatting.
+    else:
+        new_contents = raw_deployment_file_contents
 
     with prefect_file.open(mode="a") as f:
-        # If deployment.yaml is empty, write an empty deployments list to prefect.yaml.
-        if not parsed_deployment_file_contents:
-            f.write("\n")
-            f.write(yaml.dump({"deployments": []}, sort_keys=False))
-        # If there is no 'deployments' key in deployment.yaml, assume that the
-        # entire file is a single deployment.
-        elif not deployments:
-            f.write("\n")
-            f.write(
-                yaml.dump(
-                    {"deployments": [parsed_deployment_file_contents]}, sort_keys=False
-                )
-            )
-        # Write all of deployment.yaml to prefect.yaml.
-        else:
-            f.write("\n")
-            f.write(raw_deployment_file_contents)
+        f.write(f"\n{new_contents}")
 
 
 def _format_deployment_for_saving_to_prefect_file(
@@ -541,6 +541,37 @@ class TestProjectDeploySingleDeploymentYAML:
             expected_output_contains="An important name/test-name",
         )
 
+    async def test_project_deploy_reads_non_ascii_flow_name_from_deployment_yaml(
+        self, project_dir_with_single_deployment_format, prefect_client, work_pool
+    ):
+        Path("flows/unicode.py").write_text(
+            "from prefect import flow\n\n\n"
+            '@flow(name="données-flow 流程")\n'
+            "def my_flow():\n"
+            "    pass\n",
+            encoding="utf-8",
+        )
+        await register_flow("flows/unicode.py:my_flow")
+        deploy_config = {
+            "name": "test-name",
+            "flow_name": "données-flow 流程",
+            "work_pool": {"name": work_pool.name},
+        }
+
+        with Path("deployment.yaml").open(mode="w", encoding="utf-8") as f:
+            yaml.safe_dump(deploy_config, f)
+
+        await run_sync_in_worker_thread(
+            invoke_and_assert,
+            command="deploy",
+            expected_code=0,
+        )
+
+        deployment = await prefect_client.read_deployment_by_name(
+            "données-flow 流程/test-name"
+        )
+        assert deployment.entrypoint.endswith("unicode.py:my_flow")
+
     async def test_project_deploy_reads_entrypoint_from_deployment_yaml(
         self, project_dir_with_single_deployment_format, prefect_client, work_pool
     ):
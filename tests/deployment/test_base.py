@@ -1,5 +1,8 @@
 import json
+import os
 import shutil
+import stat
+import subprocess
 import sys
 from pathlib import Path
 
@@ -8,6 +11,7 @@ import yaml
 
 import prefect
 from prefect.deployments.base import (
+    _copy_deployments_into_prefect_file,
     _find_flow_functions_in_file,
     _search_for_flow_functions,
     configure_project_by_recipe,
@@ -50,6 +54,64 @@ class TestFindProject:
             == tmp_path / ".prefect"
         )
 
+    @pytest.mark.skipif(sys.platform == "win32", reason="Requires symlink support")
+    async def test_find_project_resolves_symlinks(self, tmp_path):
+        (tmp_path / ".prefect").mkdir(exist_ok=True)
+        (tmp_path / "subdir").mkdir()
+        (tmp_path / "link").symlink_to(tmp_path / "subdir")
+
+        assert find_prefect_directory(tmp_path / "subdir") == tmp_path / ".prefect"
+        assert find_prefect_directory(tmp_path / "link") == tmp_path / ".prefect"
+
+        # `..` is applied after following the symlink
+        (tmp_path / "project" / ".prefect").mkdir(parents=True)
+        (tmp_path / "subdir" / "nested").mkdir()
+        (tmp_path / "project" / "link").symlink_to(tmp_path / "subdir" / "nested")
+        assert (
+            find_prefect_directory(tmp_path / "project" / "link" / "..")
+            == tmp_path / ".prefect"
+        )
+
+    async def test_find_project_finds_directories_removed_after_a_hit(self, tmp_path):
+        (tmp_path / "project" / ".prefect").mkdir(parents=True)
+        (tmp_path / "project" / "subdir").mkdir()
+        project_dir = tmp_path / "project" / ".prefect"
+        assert find_prefect_directory(tmp_path / "project" / "subdir") == project_dir
+
+        project_dir.rmdir()
+        assert find_prefect_directory(tmp_path / "project") == tmp_path / ".prefect"
+        assert (
+            find_prefect_directory(tmp_path / "project" / "subdir")
+            == tmp_path / ".prefect"
+        )
+
+        project_dir.mkdir()
+        assert find_prefect_directory(tmp_path / "project" / "subdir") == project_dir
+
+    async def test_find_project_finds_directories_created_after_a_miss(self, tmp_path):
+        shutil.rmtree(tmp_path / ".prefect", ignore_errors=True)
+        (tmp_path / "project" / "subdir").mkdir(parents=True)
+        assert find_prefect_directory(tmp_path / "project" / "subdir") is None
+
+        project_dir = tmp_path / "project" / ".prefect"
+        project_dir.mkdir()
+        assert find_prefect_directory(tmp_path / "project" / "subdir") == project_dir
+        assert find_prefect_directory(tmp_path / "project") == project_dir
+
+    async def test_find_project_finds_closer_directories_created_after_a_hit(
+        self, tmp_path
+    ):
+        (tmp_path / "project" / "subdir").mkdir(parents=True)
+        assert (
+            find_prefect_directory(tmp_path / "project" / "subdir")
+            == tmp_path / ".prefect"
+        )
+
+        project_dir = tmp_path / "project" / ".prefect"
+        project_dir.mkdir()
+        assert find_prefect_directory(tmp_path / "project" / "subdir") == project_dir
+        assert find_prefect_directory(tmp_path / "project") == project_dir
+
 
 class TestRecipes:
     async def test_configure_project_by_recipe_raises(self):
@@ -104,6 +166,14 @@ class TestRecipes:
         ]
         assert clone_step["directory"] == "/opt/prefect/test-dir"
 
+    async def test_configure_project_by_recipe_does_not_reuse_formatting(self):
+        configure_project_by_recipe("docker", name="first-dir")
+        recipe_config = configure_project_by_recipe("docker", name="second-dir")
+        clone_step = recipe_config["pull"][0][
+            "prefect.deployments.steps.set_working_directory"
+        ]
+        assert clone_step["directory"] == "/opt/prefect/second-dir"
+
 
 class TestInitProject:
     async def test_initialize_project_works(self):
@@ -120,6 +190,58 @@ class TestInitProject:
         assert contents["name"] is not None
         assert contents["prefect-version"] == prefect.__version__
 
+    async def test_initialize_project_in_git_repo(self, project_dir):
+        git = ["git", "-c", "user.name=test", "-c", "user.email=test@example.com"]
+        for args in [
+            ["init"],
+            ["checkout", "-b", "my-branch"],
+            ["remote", "add", "origin", "https://example.com/org/repo.git"],
+            ["commit", "--allow-empty", "-m", "initial commit"],
+        ]:
+            subprocess.run(git + args, cwd=project_dir, check=True, capture_output=True)
+
+        initialize_project()
+
+        with open("prefect.yaml", "r") as f:
+            contents = yaml.safe_load(f)
+
+        clone_step = contents["pull"][0]["prefect.deployments.steps.git_clone"]
+        assert clone_step["repository"] == "https://example.com/org/repo.git"
+        assert clone_step["branch"] == "my-branch"
+
+    async def test_initialize_project_in_git_repo_without_commits(self, project_dir):
+        git = ["git", "-c", "user.name=test", "-c", "user.email=test@example.com"]
+        for args in [
+            ["init"],
+            ["remote", "add", "origin", "https://example.com/org/repo.git"],
+        ]:
+            subprocess.run(git + args, cwd=project_dir, check=True, capture_output=True)
+
+        initialize_project()
+
+        with open("prefect.yaml", "r") as f:
+            contents = yaml.safe_load(f)
+
+        clone_step = contents["pull"][0]["prefect.deployments.steps.git_clone"]
+        assert clone_step["repository"] == "https://example.com/org/repo.git"
+        assert clone_step["branch"] == "main"
+
+    async def test_initialize_project_outside_git_repo_skips_git(
+        self, project_dir, monkeypatch
+    ):
+        def fail(*args, **kwargs):
+            raise AssertionError("git should not be called outside of a repository")
+
+        monkeypatch.setattr(subprocess, "run", fail)
+        monkeypatch.setattr(subprocess, "check_output", fail)
+
+        initialize_project()
+
+        with open("prefect.yaml", "r") as f:
+            contents = yaml.safe_load(f)
+
+        assert "prefect.deployments.steps.git_clone" not in contents["pull"][0]
+
     async def test_initialize_project_with_name(self):
         files = initialize_project(name="my-test-its-a-test")
         assert len(files) >= 2
@@ -185,6 +307,9 @@ class TestRegisterFlow:
 
         assert flows["test"] == "import-project/my_module/flow.py:test_flow"
 
+        # no temporary files are left behind
+        assert list((project_dir / ".prefect").iterdir()) == [flows_file]
+
     async def test_register_flow_allows_identical_calls(self, project_dir):
         f = await register_flow(
             str(project_dir / "import-project" / "my_module" / "flow.py") + ":test_flow"
@@ -196,6 +321,80 @@ class TestRegisterFlow:
         )
         assert f.name == "test"
 
+    async def test_register_flow_requires_script_within_project(
+        self, project_dir, monkeypatch
+    ):
+        (project_dir / "subproject" / ".prefect").mkdir(parents=True)
+        monkeypatch.chdir(project_dir / "subproject")
+
+        with pytest.raises(ValueError, match="not within the project directory"):
+            await register_flow(
+                str(project_dir / "import-project" / "my_module" / "flow.py")
+                + ":test_flow"
+            )
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="Requires POSIX permissions")
+    async def test_register_flow_preserves_flows_file_permissions(self, project_dir):
+        umask = os.umask(0)
+        os.umask(umask)
+
+        await register_flow(
+            str(project_dir / "import-project" / "my_module" / "flow.py") + ":test_flow"
+        )
+
+        flows_file = project_dir / ".prefect" / "flows.json"
+        assert stat.S_IMODE(flows_file.stat().st_mode) == 0o666 & ~umask
+
+        # an existing file keeps its permissions when rewritten
+        flows_file.chmod(0o600)
+        await register_flow(
+            str(project_dir / "import-project" / "my_module" / "flow.py")
+            + ":prod_flow",
+            force=True,
+        )
+        assert stat.S_IMODE(flows_file.stat().st_mode) == 0o600
+
+    async def test_register_flow_removes_temporary_file_on_error(
+        self, project_dir, monkeypatch
+    ):
+        def fail(*args, **kwargs):
+            raise OSError("replace failed")
+
+        monkeypatch.setattr(os, "replace", fail)
+
+        with pytest.raises(OSError, match="replace failed"):
+            await register_flow(
+                str(project_dir / "import-project" / "my_module" / "flow.py")
+                + ":test_flow"
+            )
+
+        assert list((project_dir / ".prefect").iterdir()) == []
+
+    async def test_register_flow_skips_write_for_identical_calls(self, project_dir):
+        entrypoint = (
+            str(project_dir / "import-project" / "my_module" / "flow.py") + ":test_flow"
+        )
+        await register_flow(entrypoint)
+
+        flows_file = project_dir / ".prefect" / "flows.json"
+        flows_file.write_text(json.dumps(json.loads(flows_file.read_text())))
+        contents = flows_file.read_text()
+
+        f = await register_flow(entrypoint)
+        assert f.name == "test"
+        assert flows_file.read_text() == contents
+
+    async def test_register_flow_reloads_only_changed_scripts(self, project_dir):
+        script = project_dir / "import-project" / "my_module" / "flow.py"
+        first = await register_flow(f"{script}:test_flow")
+        assert await register_flow(f"{script}:test_flow") is first
+
+        mtime_ns = script.stat().st_mtime_ns + 1_000_000_000
+        os.utime(script, ns=(mtime_ns, mtime_ns))
+        reloaded = await register_flow(f"{script}:test_flow")
+        assert reloaded is not first
+        assert reloaded.name == "test"
+
     async def test_register_flow_disallows_overwrites(self, project_dir):
         f = await register_flow(
             str(project_dir / "import-project" / "my_module" / "flow.py") + ":test_flow"
@@ -216,6 +415,30 @@ class TestRegisterFlow:
         assert f.name == "test"
 
 
+class TestCopyDeployments:
+    async def test_copy_deployments_preserves_deployment_file_comments(self):
+        Path("prefect.yaml").write_text("name: test\n")
+        Path("deployment.yaml").write_text(
+            "# my deployments\ndeployments:\n  - name: test-name # inline\n"
+        )
+
+        _copy_deployments_into_prefect_file()
+
+        contents = Path("prefect.yaml").read_text()
+        assert "# my deployments" in contents
+        assert "# inline" in contents
+        assert yaml.safe_load(contents)["deployments"] == [{"name": "test-name"}]
+
+    async def test_copy_deployments_handles_empty_deployment_file(self):
+        Path("prefect.yaml").write_text("name: test\n")
+        Path("deployment.yaml").write_text("")
+
+        _copy_deployments_into_prefect_file()
+
+        with open("prefect.yaml", "r") as f:
+            assert yaml.safe_load(f)["deployments"] == []
+
+
 class TestDiscoverFlows:
     async def test_find_all_flows_in_dir_tree(self, project_dir):
         flows = await _search_for_flow_functions(str(project_dir))